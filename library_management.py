@@ -1,3 +1,16 @@
+import atexit
+import csv
+import functools
+import heapq
+import os
+import sys
+from bisect import bisect_left, bisect_right
+
+READ_BUFFER_SIZE: int = 1 << 20
+FLUSH_INTERVAL: int = 32
+SEARCH_CACHE_SIZE: int = 128
+
+
 class Book:
     """
     Класс для представления книги.
@@ -7,7 +20,11 @@ class Book:
             Преобразует объект Book в строковое представление
         from_string():
             Создает экземпляр класса книги из строки.
+        from_lines():
+            Создает список книг из строк файла данных.
     """
+    __slots__ = ("id", "title", "author", "year", "_status", "_cached_str")
+
     def __init__(self, book_id: int, title: str, author: str,
                  year: int, status: str = "в наличии") -> None:
         """
@@ -20,11 +37,23 @@ class Book:
             year: Год издания.
             status: Статус книги.
         """
-        self.id: int = book_id
-        self.title: str = title
-        self.author: str = author
-        self.year: int = year
-        self.status: str = status
+        self.id = book_id
+        self.title = title
+        self.author = author
+        self.year = year
+        self._status = status
+        self._cached_str = None
+
+    @property
+    def status(self) -> str:
+        """Статус книги."""
+        return self._status
+
+    @status.setter
+    def status(self, value: str) -> None:
+        """Изменяет статус книги и сбрасывает кэш строкового представления."""
+        self._status = value
+        self._cached_str = None
 
     def to_string(self) -> str:
         """
@@ -34,7 +63,11 @@ class Book:
             str: строка, содержащая сведения о книге в формате
                 "идентификатор; название; автор; год; статус".
         """
-        return f"{self.id};{self.title};{self.author};{self.year};{self.status}"
+        if self._cached_str is None:
+            self._cached_str = (f"{self.id};{self.title};{self.author};"
+                                f"{self.year};{self._status}")
+
+        return self._cached_str
 
     @classmethod
     def from_string(cls, string: str) -> 'Book':
@@ -44,8 +77,24 @@ class Book:
         Возвращает:
             Book: Экземпляр класса Book.
         """
-        parts: list = string.strip().split(";")
-        return cls(int(parts[0]), parts[1], parts[2], int(parts[3]), parts[4])
+        return cls.from_lines([string])[0]
+
+    @classmethod
+    def from_lines(cls, lines: list[str]) -> list['Book']:
+        """
+        Создает список книг из строк файла данных.
+
+        Поля разбираются модулем csv, реализованным на C; кавычки
+        в названиях (QUOTE_NONE) остаются частью текста.
+
+        Возвращает:
+            list[Book]: Книги в порядке следования строк.
+        """
+        reader = csv.reader(lines, delimiter=";", quoting=csv.QUOTE_NONE)
+        return [
+            cls(int(book_id), title, author, int(year), status)
+            for book_id, title, author, year, status in reader
+        ]
 
 
 class Library:
@@ -56,10 +105,16 @@ class Library:
     а также обновлять их статус.
 
     Методы:
+        close():
+            Сохраняет изменения и закрывает файл данных библиотеки.
+        flush():
+            Сохраняет отложенные изменения в файл.
         load_data():
             Загружает данные библиотеки из файла.
         save_data():
             Сохраняет текущие данные библиотеки в файл.
+        append_book():
+            Дописывает одну книгу в конец файла.
         add_book():
             Добавляет новую книгу в библиотеку.
         generate_id():
@@ -83,31 +138,221 @@ class Library:
             books (list[Book]): Список объектов класса Book,
             представляющих книги в библиотеке.
             data_file (str): Имя файла для сохранения данных библиотеки.
+            _by_id (dict[int, Book]): Книги, проиндексированные по id.
+            _max_id (int): Наибольший выданный id.
+            _free_ranges (list[tuple[int, int]]): Куча свободных
+            диапазонов id (первый, последний) ниже _max_id.
+            _titles_lc, _authors_lc: Столбцы полей книг для поиска
+            (название и автор в нижнем регистре), идущие в том же порядке,
+            что и books.
+            _haystack (str | None): Все поля из _titles_lc и _authors_lc,
+            склеенные через перевод строки; строится при поиске.
+            _field_starts (list[int]): Смещения начала полей в _haystack.
+            _year_index (dict[int, set[int]]): id книг по году издания.
+            _search_ids (Callable[[str], tuple[int, ...]]): Поиск id книг
+            с LRU-кэшем результатов, сбрасываемым при добавлении
+            и удалении книг.
+            _fd (int | None): Дескриптор файла данных для дописывания;
+            открывается при первой записи и закрывается в close()
+            или при полной перезаписи файла.
+            _eof_offset (int): Текущий размер файла данных.
+            _missing_newline (bool): Не заканчивается ли файл данных
+            переводом строки (например, после ручной правки).
+            _dirty (bool): Есть ли изменения, не записанные в файл.
+            _pending (int): Число отложенных изменений.
         """
         self.data_file: str = data_file
+        self._dirty: bool = False
+        self._pending: int = 0
         self.books: list = self.load_data()
+        self._build_indexes()
+        self._fd: int | None = None
+        self._eof_offset: int = 0
+        self._missing_newline: bool = False
+        atexit.register(self.close)
+
+    def __enter__(self) -> 'Library':
+        """Возвращает библиотеку для использования в блоке with."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Закрывает файл данных при выходе из блока with."""
+        self.close()
+
+    def close(self) -> None:
+        """Сохраняет изменения и закрывает файл данных библиотеки."""
+        try:
+            self.flush()
+        finally:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
+            atexit.unregister(self.close)
+
+    def flush(self) -> None:
+        """Сохраняет отложенные изменения в файл."""
+        if self._dirty:
+            self.save_data()
+            self._dirty = False
+            self._pending = 0
+
+    def _mark_dirty(self) -> None:
+        """
+        Откладывает перезапись файла до выхода из приложения.
+
+        Каждые FLUSH_INTERVAL изменений данные сохраняются сразу,
+        чтобы ограничить возможную потерю данных.
+        """
+        self._dirty = True
+        self._pending += 1
+        if self._pending >= FLUSH_INTERVAL:
+            self.flush()
+
+    def _open_fd(self) -> None:
+        """
+        Открывает файл данных для записи, если он еще не открыт.
+
+        Файл открывается только при первой записи, поэтому просмотр
+        библиотеки не создает файл и работает в каталоге только для чтения.
+        """
+        if self._fd is not None:
+            return
+
+        self._fd = os.open(
+            self.data_file,
+            os.O_RDWR | os.O_CREAT | getattr(os, "O_BINARY", 0), 0o644
+        )
+        self._eof_offset = os.fstat(self._fd).st_size
+        self._missing_newline = False
+        if self._eof_offset:
+            os.lseek(self._fd, self._eof_offset - 1, os.SEEK_SET)
+            self._missing_newline = os.read(self._fd, 1) != b"\n"
+
+    def _write_at(self, data: bytes, offset: int) -> None:
+        """
+        Записывает данные в файл библиотеки, начиная с указанной позиции.
+
+        Аргументы:
+            data: Записываемые байты.
+            offset: Смещение от начала файла.
+        """
+        view: memoryview = memoryview(data)
+        while view:
+            if hasattr(os, "pwrite"):
+                written: int = os.pwrite(self._fd, view, offset)
+            else:
+                os.lseek(self._fd, offset, os.SEEK_SET)
+                written = os.write(self._fd, view)
+            view = view[written:]
+            offset += written
+
+    def _build_indexes(self) -> None:
+        """Строит вспомогательные индексы по текущему списку книг."""
+        self._by_id: dict[int, Book] = {book.id: book for book in self.books}
+        self._max_id: int = max((book.id for book in self.books), default=0)
+        # Хранятся диапазоны, а не сами id: память зависит от числа книг,
+        # а не от наибольшего id в файле.
+        self._free_ranges: list[tuple[int, int]] = []
+        prev_id: int = 0
+        for book in self.books:
+            if book.id > prev_id + 1:
+                self._free_ranges.append((prev_id + 1, book.id - 1))
+            prev_id = max(prev_id, book.id)
+        self._titles_lc: list[str] = [book.title.lower() for book in self.books]
+        self._authors_lc: list[str] = [book.author.lower()
+                                       for book in self.books]
+        self._haystack: str | None = None
+        self._field_starts: list[int] = []
+        self._year_index: dict[int, set[int]] = {}
+        for book in self.books:
+            self._index_book(book)
+        self._search_ids = functools.lru_cache(maxsize=SEARCH_CACHE_SIZE)(
+            self._search_ids_uncached
+        )
 
     def load_data(self) -> list:
         """
         Загружает книги из текстового файла.
 
+        Книги с повторяющимся id (например, после ручной правки файла)
+        получают новые id, а файл помечается для перезаписи.
+
         Исключения:
             FileNotFoundError: Если не найден файл.
         """
         try:
-            with open(self.data_file, "r", encoding="utf-8") as file:
-                books = [Book.from_string(line) for line in file]
+            with open(self.data_file, "r", encoding="utf-8",
+                      buffering=READ_BUFFER_SIZE) as file:
+                data: str = file.read()
+
+            # split("\n"), а не splitlines(): последний разбивает строку
+            # и по \x0c, \x85, \u2028 и т.п., которые могут быть в названии.
+            lines: list[str] = data.split("\n")
+            if lines[-1] == "":
+                lines.pop()
+
+            books: list[Book] = []
+            duplicates: list[Book] = []
+            for book in sorted(Book.from_lines(lines), key=lambda b: b.id):
+                if books and books[-1].id == book.id:
+                    duplicates.append(book)
+                else:
+                    books.append(book)
+
+            if duplicates:
+                new_id: int = books[-1].id
+                for book in duplicates:
+                    new_id += 1
+                    print(f"Книга с повторяющимся ID {book.id} "
+                          f"получила новый ID {new_id}.")
+                    books.append(Book(new_id, book.title, book.author,
+                                      book.year, book.status))
+                self._dirty = True
 
-            return sorted(books, key=lambda b: b.id)
+            return books
 
         except FileNotFoundError:
             return []
 
     def save_data(self) -> None:
-        """Сохраняет книги в текстовый файл."""
-        with open(self.data_file, "w", encoding="utf-8") as file:
-            for book in sorted(self.books, key=lambda b: b.id):
-                file.write(book.to_string() + "\n")
+        """
+        Сохраняет книги в текстовый файл.
+
+        Данные пишутся во временный файл, который затем заменяет файл
+        данных через os.replace: при сбое процесса на диске остается
+        либо прежняя, либо новая версия целиком.
+        """
+        # Список всегда упорядочен по id, пересортировка не нужна.
+        payload: bytes = "".join(
+            book.to_string() + "\n" for book in self.books
+        ).encode("utf-8")
+        tmp_file: str = self.data_file + ".tmp"
+        with open(tmp_file, "wb") as file:
+            file.write(payload)
+            file.flush()
+            os.fsync(file.fileno())
+
+        # Дескриптор указывает на старый файл; он будет открыт заново
+        # при следующей записи.
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        os.replace(tmp_file, self.data_file)
+
+    def append_book(self, book: Book) -> None:
+        """
+        Дописывает одну книгу в конец текстового файла.
+
+        Аргументы:
+            book: Добавляемая книга.
+        """
+        data: bytes = (book.to_string() + "\n").encode("utf-8")
+        self._open_fd()
+        if self._missing_newline:
+            data = b"\n" + data
+            self._missing_newline = False
+        self._write_at(data, self._eof_offset)
+        self._eof_offset += len(data)
 
     def add_book(self) -> None:
         """
@@ -126,20 +371,34 @@ class Library:
             return
 
         new_book = Book(self.generate_id(), title, author, year)
-        self.books.append(new_book)
-        self.books.sort(key=lambda b: b.id)
-
-        self.save_data()
+        index: int = bisect_left(self.books, new_book.id, key=lambda b: b.id)
+        self.books.insert(index, new_book)
+        self._titles_lc.insert(index, new_book.title.lower())
+        self._authors_lc.insert(index, new_book.author.lower())
+        self._haystack = None
+        self._search_ids.cache_clear()
+        self._by_id[new_book.id] = new_book
+        self._index_book(new_book)
+
+        if self._dirty:
+            # Отложенная перезапись и так сохранит новую книгу.
+            self._mark_dirty()
+        else:
+            self.append_book(new_book)
         print("Книга успешно добавлена!")
 
     def generate_id(self) -> int:
         """Генерирует id для добавляемой книги."""
-        used_ids: set[int] = {book.id for book in self.books}
-        new_id: int = 1
-        while new_id in used_ids:
-            new_id += 1
+        if self._free_ranges:
+            first, last = self._free_ranges[0]
+            if first < last:
+                heapq.heapreplace(self._free_ranges, (first + 1, last))
+            else:
+                heapq.heappop(self._free_ranges)
+            return first
 
-        return new_id
+        self._max_id += 1
+        return self._max_id
 
     def delete_book(self) -> None:
         """
@@ -154,11 +413,18 @@ class Library:
             print("Ошибка: ID должен быть числом!")
             return
 
-        book = next((book for book in self.books if book.id == book_id), None)
+        book: Book | None = self._by_id.pop(book_id, None)
 
         if book:
-            self.books.remove(book)
-            self.save_data()
+            index: int = bisect_left(self.books, book_id, key=lambda b: b.id)
+            del self.books[index]
+            del self._titles_lc[index]
+            del self._authors_lc[index]
+            self._haystack = None
+            self._search_ids.cache_clear()
+            self._unindex_book(book)
+            heapq.heappush(self._free_ranges, (book.id, book.id))
+            self._mark_dirty()
             print("Книга успешно удалена!")
         else:
             print("Книга с таким ID не найдена.")
@@ -167,12 +433,8 @@ class Library:
         """Находит книги в библиотеке."""
         query: str = (input("Введите название, автора или год для поиска: ")
                       .strip().lower())
-        results: list = [
-            book for book in self.books
-            if query in book.title.lower()
-            or query in book.author.lower()
-            or query == str(book.year)
-        ]
+        results: list = [self._by_id[book_id]
+                         for book_id in self._search_ids(query)]
 
         if results:
             print("Найдены книги:")
@@ -180,6 +442,85 @@ class Library:
         else:
             print("Книг по запросу не найдено.")
 
+    def _search_ids_uncached(self, query: str) -> tuple[int, ...]:
+        """
+        Находит id книг, подходящих под запрос.
+
+        Возвращает:
+            tuple[int, ...]: id найденных книг по возрастанию.
+        """
+        ids: set[int] = self._scan_fields(query)
+        ids.update(self._year_index.get(self._parse_year(query), ()))
+
+        return tuple(sorted(ids))
+
+    def _scan_fields(self, query: str) -> set[int]:
+        """
+        Ищет подстроку в названиях и авторах всех книг.
+
+        Поиск идет по одной склеенной строке вызовами str.find,
+        поэтому перебор символов выполняется в C, а не в цикле Python.
+        Запрос не содержит перевода строки и не может захватить
+        два соседних поля.
+
+        Возвращает:
+            set[int]: id найденных книг.
+        """
+        if self._haystack is None:
+            fields: list[str] = [
+                field for pair in zip(self._titles_lc, self._authors_lc)
+                for field in pair
+            ]
+            self._haystack = "\n".join(fields)
+            self._field_starts = []
+            offset: int = 0
+            for field in fields:
+                self._field_starts.append(offset)
+                offset += len(field) + 1
+
+        ids: set[int] = set()
+        starts: list[int] = self._field_starts
+        if not starts:
+            return ids
+
+        pos: int = self._haystack.find(query)
+        while pos != -1:
+            index: int = (bisect_right(starts, pos) - 1) // 2
+            ids.add(self.books[index].id)
+            # Остальные совпадения в этой книге уже не нужны.
+            next_field: int = (index + 1) * 2
+            if next_field >= len(starts):
+                break
+            pos = self._haystack.find(query, starts[next_field])
+
+        return ids
+
+    def _index_book(self, book: Book) -> None:
+        """Добавляет книгу в индекс по году издания."""
+        self._year_index.setdefault(book.year, set()).add(book.id)
+
+    def _unindex_book(self, book: Book) -> None:
+        """Удаляет книгу из индекса по году издания."""
+        year_ids: set[int] = self._year_index[book.year]
+        year_ids.discard(book.id)
+        if not year_ids:
+            del self._year_index[book.year]
+
+    @staticmethod
+    def _parse_year(query: str) -> int | None:
+        """
+        Преобразует поисковый запрос в год.
+
+        Возвращает:
+            int | None: Год, если запрос записан как число, иначе None.
+        """
+        try:
+            year: int = int(query)
+        except ValueError:
+            return None
+
+        return year if str(year) == query else None
+
     def display_books(self, books=None) -> None:
         """Отображает все книги из библиотеки."""
         books: list = books or self.books
@@ -187,13 +528,14 @@ class Library:
         if not books:
             print("Библиотека пуста.")
         else:
-            print("-"*100)
-            for book in books:
-                print(
-                    f"| ID: {book.id} | "
-                    f"Название: {book.title}, Автор: {book.author}, "
-                    f"Год: {book.year}, Статус: {book.status}"
-                )
+            lines: list[str] = ["-"*100]
+            lines.extend(
+                f"| ID: {book.id} | "
+                f"Название: {book.title}, Автор: {book.author}, "
+                f"Год: {book.year}, Статус: {book.status}"
+                for book in books
+            )
+            sys.stdout.write("\n".join(lines) + "\n")
 
     def update_status(self) -> None:
         """
@@ -209,8 +551,7 @@ class Library:
             print("Ошибка: ID должен быть числом!")
             return
 
-        book: Book | None = (next((book for book in self.books
-                                   if book.id == book_id), None))
+        book: Book | None = self._by_id.get(book_id)
 
         if book:
             print("1 - в наличии")
@@ -224,7 +565,7 @@ class Library:
                     print("Книга уже имеет данный статус.")
                 else:
                     book.status = new_status
-                    self.save_data()
+                    self._mark_dirty()
                     print("Статус книги успешно обновлен!")
             else:
                 print("Некорректный ввод.")
@@ -234,33 +575,32 @@ class Library:
 
 def main() -> None:
     """Основная функция для запуска приложения."""
-    library = Library()
-
-    while True:
-        print("\n" + "-" * 11 + "МЕНЮ" + "-" * 11)
-        print("1 - Добавить книгу")
-        print("2 - Удалить книгу")
-        print("3 - Искать книгу")
-        print("4 - Отобразить все книги")
-        print("5 - Изменить статус книги")
-        print("6 - Выход")
-
-        choice: str = input("Выберите действие (1-6): ").strip()
-        if choice == "1":
-            library.add_book()
-        elif choice == "2":
-            library.delete_book()
-        elif choice == "3":
-            library.search_books()
-        elif choice == "4":
-            library.display_books()
-        elif choice == "5":
-            library.update_status()
-        elif choice == "6":
-            print("Выход из приложения.")
-            break
-        else:
-            print("Некорректный выбор. Попробуйте снова.")
+    with Library() as library:
+        while True:
+            print("\n" + "-" * 11 + "МЕНЮ" + "-" * 11)
+            print("1 - Добавить книгу")
+            print("2 - Удалить книгу")
+            print("3 - Искать книгу")
+            print("4 - Отобразить все книги")
+            print("5 - Изменить статус книги")
+            print("6 - Выход")
+
+            choice: str = input("Выберите действие (1-6): ").strip()
+            if choice == "1":
+                library.add_book()
+            elif choice == "2":
+                library.delete_book()
+            elif choice == "3":
+                library.search_books()
+            elif choice == "4":
+                library.display_books()
+            elif choice == "5":
+                library.update_status()
+            elif choice == "6":
+                print("Выход из приложения.")
+                break
+            else:
+                print("Некорректный выбор. Попробуйте снова.")
 
 
 if __name__ == "__main__":